@@ -1,4 +1,233 @@
+import math
 import tkinter as tk
+try:
+    import numpy as np
+except ImportError: #optional, enables _BoxArrays
+    np = None
+
+def _overlaps(a, b):
+    return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+def _contains(a, b):
+    return a[0] <= b[0] and a[1] <= b[1] and a[2] >= b[2] and a[3] >= b[3]
+
+_FOCUS_IGNORED = {'NotifyVirtual', 'NotifyNonlinearVirtual', 'NotifyPointer'}
+
+class _QuadTree:
+    '''
+    Minimal region quadtree that maps identifiers to bounding boxes.
+    Items that straddle a split line are kept in the parent node.
+    '''
+    MAX_ITEMS = 8
+    MAX_DEPTH = 16
+
+    def __init__(self, bbox, depth=0):
+        self.bbox       = bbox          #x1,y1,x2,y2 covered by this node
+        self.depth      = depth
+        self.items      = {}            #identifier -> bbox
+        self.children   = None          #four sub nodes once split
+
+    def insert(self, ident, bbox):
+        node = self._node_for(bbox)
+        node.items[ident] = bbox
+        if (node.children is None and len(node.items) > self.MAX_ITEMS
+            and node.depth < self.MAX_DEPTH):
+            node._split()
+
+    def remove(self, ident, bbox):
+        self._node_for(bbox).items.pop(ident, None)
+
+    def intersect(self, bbox) -> set:
+        'Returns a set of identifiers whose bbox overlaps the given bbox'
+        found = set()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            for ident, ibox in node.items.items():
+                if _overlaps(ibox, bbox):
+                    found.add(ident)
+            if node.children is not None:
+                stack.extend(
+                    c for c in node.children if _overlaps(c.bbox, bbox))
+        return found
+
+    def grow(self, bbox):
+        'Returns a root that covers bbox, doubling the bounds towards it'
+        root = self
+        while not _contains(root.bbox, bbox):
+            x1,y1,x2,y2 = root.bbox
+            left, up = bbox[0] < x1, bbox[1] < y1
+            xs = (x1-(x2-x1), x1, x2) if left else (x1, x2, x2+(x2-x1))
+            ys = (y1-(y2-y1), y1, y2) if up else (y1, y2, y2+(y2-y1))
+            depth = root.depth-1
+            new = _QuadTree((xs[0],ys[0],xs[2],ys[2]), depth)
+            children = [
+                _QuadTree((xs[0],ys[0],xs[1],ys[1]), root.depth),
+                _QuadTree((xs[1],ys[0],xs[2],ys[1]), root.depth),
+                _QuadTree((xs[0],ys[1],xs[1],ys[2]), root.depth),
+                _QuadTree((xs[1],ys[1],xs[2],ys[2]), root.depth)]
+            children[up*2+left] = root #the old root is one quadrant
+            new.children = tuple(children)
+            root = new
+        return root
+
+    def _node_for(self, bbox):
+        node = self
+        while node.children is not None:
+            for child in node.children:
+                if _contains(child.bbox, bbox):
+                    node = child
+                    break
+            else:
+                break
+        return node
+
+    def _split(self):
+        x1,y1,x2,y2 = self.bbox
+        mx,my = (x1+x2)/2, (y1+y2)/2
+        depth = self.depth+1
+        self.children = (
+            _QuadTree((x1,y1,mx,my), depth), _QuadTree((mx,y1,x2,my), depth),
+            _QuadTree((x1,my,mx,y2), depth), _QuadTree((mx,my,x2,y2), depth))
+        items, self.items = self.items, {}
+        for ident, bbox in items.items():
+            self.insert(ident, bbox)
+
+class _BoxArrays:
+    '''
+    Bounding boxes stored as parallel float32 arrays (requires numpy).
+    Next to x1,y1,x2,y2 the unscaled padding of each box is kept, so move
+    and scale update the rows in place and queries are one vectorized mask.
+    '''
+    _FIELDS = ('_ids', '_x1', '_y1', '_x2', '_y2', '_pl', '_pt', '_pr', '_pb')
+
+    def __init__(self, cap=64):
+        self._ids = np.empty(cap, np.int32)
+        for name in self._FIELDS[1:]:
+            setattr(self, name, np.empty(cap, np.float32))
+        self._rows = {}                 #identifier -> row
+        self._n = 0                     #rows in use
+
+    def set(self, ident, bbox, pad):
+        row = self._rows.get(ident)
+        if row is None:
+            row = self._rows[ident] = self._n
+            self._n += 1
+            if self._n > len(self._ids):
+                self._grow()
+            self._ids[row] = ident
+        self._x1[row], self._y1[row], self._x2[row], self._y2[row] = bbox
+        self._pl[row], self._pt[row], self._pr[row], self._pb[row] = pad
+
+    def remove(self, ident):
+        row = self._rows.pop(ident, None)
+        if row is None:
+            return
+        self._n -= 1
+        last = self._n
+        if row != last: #fill the gap with the last row
+            for name in self._FIELDS:
+                arr = getattr(self, name)
+                arr[row] = arr[last]
+            self._rows[int(self._ids[row])] = row
+
+    def transform(self, idents, ax, bx, ay, by):
+        'Applies x -> ax*x+bx and y -> ay*y+by to the boxes of idents'
+        if idents is None:
+            rows = slice(0, self._n)
+        else:
+            rows = np.fromiter(
+                (self._rows[i] for i in idents if i in self._rows), np.intp)
+        pl, pt = self._pl[rows], self._pt[rows]
+        pr, pb = self._pr[rows], self._pb[rows]
+        x1, x2 = ax*(self._x1[rows]+pl)+bx, ax*(self._x2[rows]-pr)+bx
+        y1, y2 = ay*(self._y1[rows]+pt)+by, ay*(self._y2[rows]-pb)+by
+        self._x1[rows] = np.minimum(x1, x2)-pl
+        self._x2[rows] = np.maximum(x1, x2)+pr
+        self._y1[rows] = np.minimum(y1, y2)-pt
+        self._y2[rows] = np.maximum(y1, y2)+pb
+
+    def intersect(self, bbox) -> set:
+        'Returns a set of identifiers whose bbox overlaps the given bbox'
+        n = self._n
+        vx1,vy1,vx2,vy2 = bbox
+        mask = ((self._x2[:n] >= vx1) & (self._x1[:n] <= vx2)
+                & (self._y2[:n] >= vy1) & (self._y1[:n] <= vy2))
+        return set(self._ids[:n][mask].tolist())
+
+    def _grow(self):
+        cap = len(self._ids)*2
+        for name in self._FIELDS:
+            arr = getattr(self, name)
+            new = np.empty(cap, arr.dtype)
+            new[:len(arr)] = arr
+            setattr(self, name, new)
+
+class _BoxDict:
+    '''
+    Counterpart of _BoxArrays without numpy. Boxes are kept in a dict and
+    queried through a _QuadTree, which is rebuilt after move and scale.
+    '''
+
+    def __init__(self):
+        self._boxes = {}                #identifier -> (bbox, padding)
+        self._tree  = None              #_QuadTree of the bboxes
+        self._dirty = False             #rebuild _tree before next query
+
+    def set(self, ident, bbox, pad):
+        old = self._boxes.get(ident)
+        self._boxes[ident] = (bbox, pad)
+        if self._dirty:
+            return
+        if old is not None:
+            self._tree.remove(ident, old[0])
+        if self._tree is None:
+            x1,y1,x2,y2 = bbox
+            self._tree = _QuadTree((x1, y1, max(x2, x1+1), max(y2, y1+1)))
+        elif not _contains(self._tree.bbox, bbox):
+            self._tree = self._tree.grow(bbox)
+        self._tree.insert(ident, bbox)
+
+    def remove(self, ident):
+        old = self._boxes.pop(ident, None)
+        if old is not None and not self._dirty:
+            self._tree.remove(ident, old[0])
+
+    def transform(self, idents, ax, bx, ay, by):
+        'Applies x -> ax*x+bx and y -> ay*y+by to the boxes of idents'
+        boxes = self._boxes
+        for ident in (list(boxes) if idents is None else idents):
+            entry = boxes.get(ident)
+            if entry is None:
+                continue
+            (x1,y1,x2,y2), (pl,pt,pr,pb) = entry
+            x1,x2 = ax*(x1+pl)+bx, ax*(x2-pr)+bx
+            y1,y2 = ay*(y1+pt)+by, ay*(y2-pb)+by
+            boxes[ident] = ((min(x1,x2)-pl, min(y1,y2)-pt,
+                             max(x1,x2)+pr, max(y1,y2)+pb), entry[1])
+        self._dirty = True
+
+    def intersect(self, bbox) -> set:
+        'Returns a set of identifiers whose bbox overlaps the given bbox'
+        if self._dirty:
+            self._rebuild()
+        if self._tree is None:
+            return set()
+        return self._tree.intersect(bbox)
+
+    def _rebuild(self):
+        self._dirty = False
+        self._tree = None
+        if not self._boxes:
+            return
+        boxes = [bbox for bbox, _ in self._boxes.values()]
+        x1 = min(b[0] for b in boxes)
+        y1 = min(b[1] for b in boxes)
+        bounds = (x1, y1, max(max(b[2] for b in boxes), x1+1),
+                  max(max(b[3] for b in boxes), y1+1))
+        self._tree = _QuadTree(bounds)
+        for ident, (bbox, _) in self._boxes.items():
+            self._tree.insert(ident, bbox)
 
 class InfiniteCanvas(tk.Canvas):
     '''
@@ -52,9 +281,26 @@ class InfiniteCanvas(tk.Canvas):
         self._xshifted  = 0             #view moved in x direction
         self._yshifted  = 0             #view moved in y direction
         self._use_multi = False         #Multiplier for View-manipulation
+        self._has_focus = False         #bindings are only served with focus
+        self._wheel_accum_x = 0         #MouseWheel delta not yet scrolled
+        self._wheel_accum_y = 0         #MouseWheel delta not yet scrolled
         self.configure(confine=False)   #confine=False ignores scrollregion
         self.dropped    = set()         #storage
         self.entered    = set()         #storage
+        self._inview    = set()         #identifiers tagged with "inview"
+        self._all_items = set()         #identifiers of all items
+        self._update_pending = False    #_update_tags scheduled for idle
+        self._update_after = None       #after_idle id of _do_update_tags
+        self._inview_stale = False      #items changed since _update_tags
+        self._last_vbox = None          #viewing_box of last <<ViewConfigure>>
+        self._zoomed    = False         #zoom since last <<ViewConfigure>>
+        self._index     = (             #spatial index of the item bboxes
+            _BoxArrays() if np is not None else _BoxDict())
+        self._transforms = []           #move/scale not yet in self._index
+        self._window_sizes = {}         #identifier -> size of its window
+        self._vbox_cache= None          #memoized viewing_box
+        self._width     = self.winfo_width()  #updated on <Configure>
+        self._height    = self.winfo_height() #updated on <Configure>
         #NotificationBindings
         self.event_add('<<VerticalScroll>>',    '<MouseWheel>')
         self.event_add('<<HorizontalScroll>>',  '<Shift-MouseWheel>')
@@ -86,26 +332,89 @@ class InfiniteCanvas(tk.Canvas):
             '<KeyPress-Control_L>',     self._configure_multi)
         self.bind(
             '<KeyRelease-Control_L>',   self._configure_multi)
+        #Internal bindings, on a private bindtag so self.bind can't replace
+        tag = f'InfiniteCanvas{self._w}'
+        self.bindtags((tag,)+self.bindtags())
+        self._bind(('bind', tag),
+            '<Configure>',              self._configure_size, None)
+        self._bind(('bind', tag),
+            '<Destroy>',                self._on_destroy, None)
+        focus = self.register(self._configure_focus) #needs %d detail
+        self.tk.call('bind', tag,
+            '<FocusIn>',                f'{focus} FocusIn %d')
+        self.tk.call('bind', tag,
+            '<FocusOut>',               f'{focus} FocusOut %d')
         return None
 
+    def configure(self, cnf=None, **kw):
+        'Configure resources of a widget.'
+        self._vbox_cache = None #style options may change
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def _on_destroy(self, event):
+        #also reached when Tcl destroys the widget, e.g. WM_DELETE_WINDOW
+        if event.widget is self and self._update_pending:
+            self.after_cancel(self._update_after)
+            self._update_pending = False
+
     def viewing_box(self) -> tuple:
         'Returns a tuple of the form x1,y1,x2,y2 represents visible area'
+        if self._vbox_cache is not None:
+            return self._vbox_cache
         off = (int(self.cget('highlightthickness'))
                +int(self.cget('borderwidth')))
         x1 = 0 - self._xshifted+off
         y1 = 0 - self._yshifted+off
-        x2 = self.winfo_width()-self._xshifted-off-1
-        y2 = self.winfo_height()-self._yshifted-off-1
-        return x1,y1,x2,y2
+        x2 = self._width-self._xshifted-off-1
+        y2 = self._height-self._yshifted-off-1
+        self._vbox_cache = x1,y1,x2,y2
+        return self._vbox_cache
+
+    def _scan_shift(self, dx, dy):
+        #moves the view by exact pixels, x/yview_scroll only knows units
+        self.scan_mark(0, 0) #any point works, only the difference counts
+        self.scan_dragto(dx, dy, gain=1)
+        self._shift_view(dx, dy)
+
+    def _shift_view(self, dx, dy):
+        #moves the memoized viewing box along with the view
+        self._xshifted += dx
+        self._yshifted += dy
+        if self._vbox_cache is not None:
+            x1,y1,x2,y2 = self._vbox_cache
+            self._vbox_cache = x1-dx, y1-dy, x2-dx, y2-dy
+
+    def _configure_size(self, event):
+        if (event.width, event.height) == (self._width, self._height):
+            return
+        self._width = event.width
+        self._height= event.height
+        self._vbox_cache = None
+        self._schedule_update()
 
     def inview(self) -> set:
         'Returns a set of identifiers that are currently viewed'
-        return set(self.find_overlapping(*self.viewing_box()))
+        return set(self._visible())
 
     def outofview(self) -> set:
         'Returns a set of identifiers that are currently NOT viewed'
-        all_ = set(self.find_all())
-        return all_ - self.inview()
+        return self._all_items - self._visible()
+
+    def _visible(self) -> set:
+        #self._inview unless items or the view changed since _update_tags
+        if self._inview_stale or self._update_pending:
+            return self._overlapping(self.viewing_box())
+        return self._inview
+
+    def _configure_focus(self, et, detail):
+        if detail in _FOCUS_IGNORED:
+            return #focus moved to or from a descendant or the pointer
+        if et == 'FocusIn':
+            self._has_focus = True
+        elif et == 'FocusOut':
+            self._has_focus = False
 
     def _configure_multi(self, event):
         if (et:=event.type.name) == 'KeyPress':
@@ -114,13 +423,14 @@ class InfiniteCanvas(tk.Canvas):
             self._use_multi = False
         
     def _zoom(self,event):
-        if str(self.focus_get()) == str(self):
-            x = canvas.canvasx(event.x)
-            y = canvas.canvasy(event.y)
+        if self._has_focus:
+            x = self.canvasx(event.x)
+            y = self.canvasy(event.y)
             multiplier = 1.005 if self._use_multi else 1.001
-            factor = multiplier ** event.delta
-            canvas.scale('all', x, y, factor, factor)
-            self._update_tags()
+            factor = math.pow(multiplier, event.delta)
+            self.scale('all', x, y, factor, factor)
+            self._zoomed = True
+            self._schedule_update()
 
     def _prepend_drag_scroll(self, event):
         if (et:=event.type.name) == 'KeyPress':
@@ -135,50 +445,232 @@ class InfiniteCanvas(tk.Canvas):
 
     def _update_tags(self):
         vbox = self.viewing_box()
-        old = set(self.find_withtag('inview'))
-        self.addtag_overlapping('inview',*vbox)
-        inbox = set(self.find_overlapping(*vbox))
-        witag = set(self.find_withtag('inview'))
-        self.dropped = witag-inbox
+        new = self._overlapping(vbox)
+        old = self._inview
+        self.dropped = old-new
+        self.entered = new-old
+        if len(self.dropped) > len(new):
+            #cheaper to clear the tag with one call and re-add it
+            self.dtag('inview', 'inview')
+            tagged = new
+        else:
+            for i in self.dropped:
+                self.dtag(i, 'inview')
+            tagged = self.entered
+        for i in tagged:
+            self.addtag_withtag('inview', i)
+        self._inview = new
+        self._inview_stale = False
         if self.dropped:
-            [self.dtag(i, 'inview') for i in self.dropped]
             self.event_generate('<<ItemsDropped>>')
-        new = set(self.find_withtag('inview'))
-        self.entered = new-old
         if self.entered:
             self.event_generate('<<ItemsEntered>>')
-        self.event_generate('<<ViewConfigure>>')
-        
-    def _create(self, *args):
-        ident = super()._create(*args)
+        #item changes in a handler must not trigger another notification
+        if vbox != self._last_vbox or self._zoomed:
+            self._last_vbox = vbox
+            self._zoomed = False
+            self.event_generate('<<ViewConfigure>>')
+
+    def _schedule_update(self):
+        #coalesces bursts of motion into a single _update_tags
+        if not self._update_pending:
+            self._update_pending = True
+            self._update_after = self.after_idle(self._do_update_tags)
+
+    def _do_update_tags(self):
+        self._update_pending = False
+        if self._transforms:
+            self._refresh_index()
+        self._update_tags()
+
+    def _overlapping(self, vbox) -> set:
+        if self._transforms: #the index is stale until _refresh_index
+            return set(self.find_overlapping(*vbox))
+        return self._index.intersect(vbox)
+
+    def _refresh_index(self):
+        #applies the pending move/scale transforms to the index
+        transforms, self._transforms = self._transforms, []
+        for idents, ax,bx,ay,by in transforms:
+            self._index.transform(
+                None if idents == 'all' else idents, ax,bx,ay,by)
+
+    def _add_transform(self, tagOrId, ax, bx, ay, by):
+        #x -> ax*x+bx, successive calls on the same items are combined
+        #ids are resolved now, tags may change before _refresh_index
+        idents = 'all' if tagOrId == 'all' else self.find_withtag(tagOrId)
+        transforms = self._transforms
+        if transforms and transforms[-1][0] == idents:
+            _, ax0,bx0,ay0,by0 = transforms[-1]
+            transforms[-1] = [idents, ax*ax0, ax*bx0+bx, ay*ay0, ay*by0+by]
+        else:
+            transforms.append([idents, ax, bx, ay, by])
+
+    def _distance(self, value) -> float:
+        #Tk accepts screen distances like '1c' where it accepts numbers
+        if isinstance(value, (int, float)):
+            return float(value)
+        return self.winfo_fpixels(value)
+
+    def _index_item(self, ident):
+        if self._transforms:
+            self._refresh_index()
+        bbox = super().bbox(ident)
+        if bbox is None:
+            self._index.remove(ident)
+            return
+        #bbox minus the part that scales, the coordinates (or anchor point)
+        coords = super().coords(ident) or bbox
+        xs, ys = coords[0::2], coords[1::2]
+        pad = (max(0, min(xs)-bbox[0]), max(0, min(ys)-bbox[1]),
+               max(0, bbox[2]-max(xs)), max(0, bbox[3]-max(ys)))
+        self._index.set(ident, bbox, pad)
+
+    def _reindex(self, tagOrId):
+        for ident in self.find_withtag(tagOrId):
+            self._index_item(ident)
+
+    def _track_window(self, ident):
+        #geometry of embedded windows propagates after create_window
+        window = super().itemcget(ident, 'window')
+        if window:
+            self.nametowidget(window).bind(
+                '<Configure>',
+                lambda e, ident=ident:self._window_configured(e, ident),
+                add='+')
+
+    def _window_configured(self, event, ident):
+        #the canvas also moves its windows on scroll, only sizes matter
+        size = event.width, event.height
+        if ident in self._all_items and self._window_sizes.get(ident) != size:
+            self._window_sizes[ident] = size
+            self._index_item(ident)
+            self._inview_stale = True
+
+    def _create(self, itemType, args, kw):
+        ident = super()._create(itemType, args, kw)
+        self._all_items.add(ident)
+        self._index_item(ident)
+        if itemType == 'window':
+            self._track_window(ident)
         self._update_tags()
         return ident
 
+    def delete(self, *args):
+        'Delete items identified by all tag or ids contained in ARGS.'
+        idents = set()
+        for tagOrId in args:
+            idents.update(self.find_withtag(tagOrId))
+        super().delete(*args)
+        for ident in idents:
+            self._index.remove(ident)
+            self._window_sizes.pop(ident, None)
+        self._inview -= idents
+        self._all_items -= idents
+        self._inview_stale = True
+
+    def coords(self, *args):
+        'Return a list of coordinates for the item given in ARGS.'
+        result = super().coords(*args)
+        if len(args) > 1:
+            self._reindex(args[0])
+            self._inview_stale = True
+        return result
+
+    def move(self, tagOrId, xAmount, yAmount):
+        'Move an item TAGORID given in ARGS.'
+        super().move(tagOrId, xAmount, yAmount)
+        self._add_transform(tagOrId, 1, self._distance(xAmount),
+                            1, self._distance(yAmount))
+        self._inview_stale = True
+
+    def moveto(self, tagOrId, x='', y=''):
+        'Move the items given by TAGORID in the canvas coordinate space.'
+        super().moveto(tagOrId, x, y)
+        self._reindex(tagOrId)
+        self._inview_stale = True
+
+    def scale(self, tagOrId, xOrigin, yOrigin, xScale, yScale):
+        'Scale item TAGORID with XORIGIN, YORIGIN, XSCALE, YSCALE.'
+        super().scale(tagOrId, xOrigin, yOrigin, xScale, yScale)
+        xo, yo = self._distance(xOrigin), self._distance(yOrigin)
+        xs, ys = float(xScale), float(yScale)
+        self._add_transform(tagOrId, xs, xo*(1-xs), ys, yo*(1-ys))
+        self._inview_stale = True
+
+    def itemconfigure(self, tagOrId, cnf=None, **kw):
+        'Configure resources of an item TAGORID.'
+        result = super().itemconfigure(tagOrId, cnf, **kw)
+        if kw or isinstance(cnf, dict):
+            self._reindex(tagOrId)
+            if 'window' in kw or isinstance(cnf, dict) and 'window' in cnf:
+                for ident in self.find_withtag(tagOrId):
+                    self._track_window(ident)
+            self._inview_stale = True
+        return result
+
+    itemconfig = itemconfigure
+
+    def insert(self, *args):
+        'Insert TEXT in item TAGORID at position POS.'
+        super().insert(*args)
+        self._reindex(args[0])
+        self._inview_stale = True
+
+    def dchars(self, *args):
+        'Delete characters of a text item TAGORID from FIRST to LAST.'
+        super().dchars(*args)
+        self._reindex(args[0])
+        self._inview_stale = True
+
     def _wheel_scroll(self, event, xy):
-        if str(self.focus_get()) == str(self):
-            parsed = int(event.delta/120)
-            amount = parsed*10 if self._use_multi else parsed
-            cx,cy = self.winfo_rootx(), self.winfo_rooty()
-            self.scan_mark(cx, cy)
-            if xy == 'x': x,y = cx+amount, cy
-            elif xy == 'y': x,y = cx, cy+amount
-            name = f'_{xy}shifted'
-            setattr(self,name, getattr(self,name)+amount)
-            self.scan_dragto(x,y, gain=1)
+        if self._has_focus:
+            #small deltas of smooth scrolling add up to whole ticks
+            multi = 10 if self._use_multi else 1
+            if xy == 'x':
+                acc = self._wheel_accum_x+event.delta
+                parsed = int(acc/120)
+                self._wheel_accum_x = acc-parsed*120
+                if parsed == 0:
+                    return
+                self._scan_shift(parsed*multi, 0)
+            else:
+                acc = self._wheel_accum_y+event.delta
+                parsed = int(acc/120)
+                self._wheel_accum_y = acc-parsed*120
+                if parsed == 0:
+                    return
+                self._scan_shift(0, parsed*multi)
+            self._schedule_update() #before <<Scroll>>, inview() sees the view
             self.event_generate('<<Scroll>>')
-            self._update_tags()
 
     def _drag_scroll(self,event):
-        if str(self.focus_get()) == str(self):
-            self._xshifted += event.x-self._recent_drag_point_x
-            self._yshifted += event.y-self._recent_drag_point_y
+        if self._has_focus:
+            self._shift_view(event.x-self._recent_drag_point_x,
+                             event.y-self._recent_drag_point_y)
             gain = 2 if self._use_multi else 1
             self.scan_dragto(event.x, event.y, gain=gain)
             self._recent_drag_point_x = event.x
             self._recent_drag_point_y = event.y
             self.scan_mark(event.x,event.y)
+            self._schedule_update() #before <<Scroll>>, inview() sees the view
             self.event_generate('<<Scroll>>')
-            self._update_tags()
+
+#place options of the resize handles around a WrapperFrame with a rim of 5
+_RIM_SPECS = (
+    ('nw', 'edge',   {'relx':0,'rely':0,'height':5,'width':5,'anchor':'nw'}),
+    ('n',  'corner', {'relx':0,'x':5,'rely':0,'height':5,
+                      'relwidth':1,'width':-10}),
+    ('ne', 'edge',   {'relx':1,'rely':0,'height':5,'width':5,'anchor':'ne'}),
+    ('e',  'corner', {'relx':1,'x':-5,'rely':0,'y':5,'width':5,
+                      'relheight':1,'height':-10}),
+    ('se', 'edge',   {'relx':1,'rely':1,'height':5,'width':5,'anchor':'se'}),
+    ('s',  'corner', {'relx':0,'x':5,'rely':1,'y':-5,'height':5,
+                      'relwidth':1,'width':-10}),
+    ('sw', 'edge',   {'relx':0,'rely':1,'height':5,'width':5,'anchor':'sw'}),
+    ('w',  'corner', {'relx':0,'rely':0,'y':5,'width':5,
+                      'relheight':1,'height':-10}),
+    )
 
 class WrapperFrame(tk.Frame):
 
@@ -187,6 +679,13 @@ class WrapperFrame(tk.Frame):
         super().__init__(master,bg='black')
         rim = 5
         self.child = widget
+        self._resize_pending = False    #_apply_resize scheduled for idle
+        self._resize_after = None       #after_idle id of _apply_resize
+        m = master                      #bound once, used on every resize
+        self._m_itemconfig = m.itemconfig
+        self._m_coords  = m.coords
+        self._m_canvasx = m.canvasx
+        self._m_canvasy = m.canvasy
         if widget.master != master:
             self.destroy()
             raise RuntimeError(
@@ -195,35 +694,14 @@ class WrapperFrame(tk.Frame):
             in_=self, fill=tk.BOTH, expand=True, padx=rim, pady=rim)
 
         #https://stackoverflow.com/q/64066592/13629335
-        blues = {'se' : (1,1),'ne' : (1,0),'nw' : (0,0),'sw' : (0,1)}
-        grens = {'e' : (1,0.5), 'n' : (0.5,0), 'w' : (0,0.5), 's' : (0.5,1)}
-        
-        for idx,i in enumerate(['nw','n','ne','e','se','s','sw','w']):
-            bg = edgecolor if (idx % 2) == 0 else cornercolor
+        for mode, kind, kw in _RIM_SPECS:
+            bg = edgecolor if kind == 'edge' else cornercolor
             ref= tk.Label(self, bg=bg)
-            kw = {}
-            if idx in [0,2,4,6]:#nw,ne,se,sw
-                kw.update({'height':rim,'width':rim,'anchor':i})
-                if idx == 0: kw.update({'relx':0,'rely':0})
-                if idx == 2: kw.update({'relx':1,'rely':0})
-                if idx == 4: kw.update({'relx':1,'rely':1})
-                if idx == 6: kw.update({'relx':0,'rely':1})
-            elif idx in [1,5]:#n,s
-                kw.update(
-                    {'relx':0,'x':rim,'height':rim,
-                     'relwidth':1,'width':-rim*2})
-                if i == 'n': kw.update({'rely':0})
-                elif i == 's': kw.update({'rely':1,'y':-rim})
-            elif idx in [3,7]:#e,w
-                kw.update(
-                    {'rely':0,'y':rim,'width':rim,
-                     'relheight':1,'height':-rim*2})
-                if i == 'e': kw.update({'relx':1,'x':-rim})
-                elif i == 'w': kw.update({'relx':0})
             ref.place(**kw)
-            ref.bind("<B1-Motion>", lambda e, mode=i:self._resize(e,mode))
+            ref.bind("<B1-Motion>", lambda e, mode=mode:self._resize(e,mode))
             ref.bind('<ButtonPress-1>', self.start_drag)
         self.child.tkraise()
+        self.bind('<Destroy>', self._on_destroy, add='+')
         return None
 
     def start_drag(self,event):
@@ -254,14 +732,26 @@ class WrapperFrame(tk.Frame):
         if 'w' in mode:
             self.calc_w = width+x_motion
             self.calc_x = x-x_motion
-        self.master.itemconfig(
-            self.cvid,width=self.calc_w,height=self.calc_h)
-        cx = self.master.canvasx(self.calc_x)
-        cy = self.master.canvasy(self.calc_y)
-        self.master.coords(self.cvid, cx, cy)
-        self.after_idle(self.update_idletasks)
+        if not self._resize_pending:
+            self._resize_pending = True
+            self._resize_after = self.after_idle(self._apply_resize)
         return 'break'
 
+    def _on_destroy(self, event):
+        #also reached when Tcl destroys the widget, e.g. WM_DELETE_WINDOW
+        if event.widget is self and self._resize_pending:
+            self.after_cancel(self._resize_after)
+            self._resize_pending = False
+
+    def _apply_resize(self):
+        #applies the latest calc_* values once per idle cycle
+        self._resize_pending = False
+        self._m_itemconfig(
+            self.cvid,width=self.calc_w,height=self.calc_h)
+        cx = self._m_canvasx(self.calc_x)
+        cy = self._m_canvasy(self.calc_y)
+        self._m_coords(self.cvid, cx, cy)
+
     def _drag(self, event):
         return
 